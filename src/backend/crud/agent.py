@@ -1,4 +1,7 @@
-from sqlalchemy.orm import Session
+import datetime
+
+from sqlalchemy import delete, tuple_, update
+from sqlalchemy.orm import Session, selectinload
 
 from backend.database_models.agent import Agent
 from backend.schemas.agent import UpdateAgent
@@ -23,18 +26,39 @@ def create_agent(db: Session, agent: Agent) -> Agent:
     return agent
 
 
-def get_agent_by_id(db: Session, agent_id: str) -> Agent:
+def get_agent_by_id(
+    db: Session, agent_id: str, load_tools_metadata: bool = False
+) -> Agent:
     """
     Get an agent by its ID.
 
     Args:
       db (Session): Database session.
       agent_id (str): Agent ID.
+      load_tools_metadata (bool): Whether to load the agent tools metadata upfront, for
+        callers serializing the whole agent. Otherwise it is loaded on first access.
 
     Returns:
       Agent: Agent with the given ID.
     """
-    return db.query(Agent).filter(Agent.id == agent_id).first()
+    query = db.query(Agent).filter(Agent.id == agent_id)
+    if load_tools_metadata:
+        query = query.options(selectinload(Agent.tools_metadata))
+    return query.first()
+
+
+def get_agent_user_id(db: Session, agent_id: str) -> str | None:
+    """
+    Get the ID of the user owning an agent, without loading the agent.
+
+    Args:
+      db (Session): Database session.
+      agent_id (str): Agent ID.
+
+    Returns:
+      str | None: User ID, or None if no agent has the given ID.
+    """
+    return db.query(Agent.user_id).filter(Agent.id == agent_id).scalar()
 
 
 def get_agent_by_name(db: Session, agent_name: str) -> Agent:
@@ -56,53 +80,91 @@ def get_agents(
     offset: int = 0,
     limit: int = 100,
     organization_id: str = None,
+    after: tuple[datetime.datetime, str] = None,
 ) -> list[Agent]:
     """
-    Get all agents for a user.
+    Get all agents for a user, ordered by creation date.
 
     Args:
       db (Session): Database session.
       offset (int): Offset of the results.
       limit (int): Limit of the results.
       organization_id (str): Organization ID.
+      after (tuple[datetime.datetime, str]): Keyset cursor, the (created_at, id) of the
+        last agent of the previous page. Only agents after it are returned.
 
     Returns:
       list[Agent]: List of agents.
     """
-    query = db.query(Agent)
+    # Loads the tools metadata of the whole page in a single query, instead of one
+    # lazy load per agent
+    query = db.query(Agent).options(selectinload(Agent.tools_metadata))
     if organization_id is not None:
         query = query.filter(Agent.organization_id == organization_id)
-    query = query.offset(offset).limit(limit)
+    if after is not None:
+        # Seeks through the agents_created_id_idx index, which unlike an offset
+        # does not scan the rows of every previous page
+        query = query.filter(tuple_(Agent.created_at, Agent.id) > tuple_(*after))
+    query = query.order_by(Agent.created_at, Agent.id).offset(offset).limit(limit)
     return query.all()
 
 
-def update_agent(db: Session, agent: Agent, new_agent: UpdateAgent) -> Agent:
+def update_agent_by_id(
+    db: Session, agent_id: str, new_agent: UpdateAgent
+) -> Agent | None:
     """
-    Update an agent.
+    Update an agent by ID in a single UPDATE ... RETURNING statement, without loading it first.
+
+    Commits the session. The returned agent is left unexpired, so reading it after
+    the commit does not reload it from the database.
 
     Args:
       db (Session): Database session.
-      agent (Agent): Agent to be updated.
+      agent_id (str): Agent ID.
       new_agent (UpdateAgent): New agent.
 
     Returns:
-      Agent: Updated agent.
+      Agent | None: Updated agent, or None if no agent has the given ID.
     """
-    for attr, value in new_agent.model_dump(exclude_none=True).items():
-        setattr(agent, attr, value)
-    db.commit()
-    db.refresh(agent)
+    values = new_agent.model_dump(exclude_none=True)
+    if not values:
+        return get_agent_by_id(db, agent_id, load_tools_metadata=True)
+
+    agent = db.execute(
+        update(Agent)
+        .where(Agent.id == agent_id)
+        .values(**values)
+        .returning(Agent)
+        .options(selectinload(Agent.tools_metadata))
+    ).scalar_one_or_none()
+
+    # Keep the attributes returned by the UPDATE, expiring them on commit would
+    # reload the agent as soon as it is read
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
     return agent
 
 
-def delete_agent(db: Session, agent_id: str) -> None:
+def delete_agent(db: Session, agent_id: str) -> Agent | None:
     """
     Delete an agent by ID.
 
     Args:
         db (Session): Database session.
         agent_id (str): Agent ID.
+
+    Returns:
+        Agent | None: Deleted agent, or None if no agent has the given ID.
     """
-    agent = db.query(Agent).filter(Agent.id == agent_id)
-    agent.delete()
+    agent = db.execute(
+        delete(Agent).where(Agent.id == agent_id).returning(Agent)
+    ).scalar_one_or_none()
+    # Detach the deleted agent so its loaded attributes stay readable after commit
+    if agent:
+        db.expunge(agent)
     db.commit()
+    return agent
@@ -24,16 +24,17 @@ def create_agent_tool_metadata(
 
 
 def get_agent_tool_metadata_by_id(
-    db: Session, agent_tool_metadata_id: str
+    db: Session, agent_tool_metadata_id: str, agent_id: str = None
 ) -> AgentToolMetadata:
     """
-    Get a agent tool metadata by its ID.
+    Get a agent tool metadata by its ID, optionally scoped to an agent.
     """
-    return (
-        db.query(AgentToolMetadata)
-        .filter(AgentToolMetadata.id == agent_tool_metadata_id)
-        .first()
+    query = db.query(AgentToolMetadata).filter(
+        AgentToolMetadata.id == agent_tool_metadata_id
     )
+    if agent_id is not None:
+        query = query.filter(AgentToolMetadata.agent_id == agent_id)
+    return query.first()
 
 
 def get_all_agent_tool_metadata_by_agent_id(
@@ -67,10 +68,8 @@ def delete_agent_tool_metadata_by_id(db: Session, agent_tool_metadata_id: str) -
     """
     Delete a agent tool metadata by its ID.
     """
-    agent_tool_metadata = (
-        db.query(AgentToolMetadata)
-        .filter(AgentToolMetadata.id == agent_tool_metadata_id)
-        .first()
+    agent_tool_metadata = db.query(AgentToolMetadata).filter(
+        AgentToolMetadata.id == agent_tool_metadata_id
     )
-    db.delete(agent_tool_metadata)
+    agent_tool_metadata.delete()
     db.commit()
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from sqlalchemy import Float, ForeignKey, Integer, Text, UniqueConstraint
+from sqlalchemy import Float, ForeignKey, Index, Integer, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -36,4 +36,7 @@ class Agent(Base):
         )
     )
 
-    __table_args__ = (UniqueConstraint("name", "version", name="_name_version_uc"),)
+    __table_args__ = (
+        UniqueConstraint("name", "version", name="_name_version_uc"),
+        Index("agents_created_id_idx", "created_at", "id"),
+    )
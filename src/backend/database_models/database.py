@@ -11,8 +11,16 @@ load_dotenv()
 SQLALCHEMY_DATABASE_URL = os.environ.get(
     "DATABASE_URL", "postgresql+psycopg2://postgres:postgres@db:5432"
 )
+# Single engine shared by every request, sized so that concurrent requests check
+# out pooled connections instead of queueing on (or re-opening) them. Stale
+# connections are detected before use and recycled hourly.
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, pool_size=5, max_overflow=10, pool_timeout=30
+    SQLALCHEMY_DATABASE_URL,
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=3600,
 )
 
 
@@ -11,6 +11,7 @@ from starlette.middleware.sessions import SessionMiddleware
 
 from backend.config.auth import get_auth_strategy_endpoints, is_authentication_enabled
 from backend.config.routers import ROUTER_DEPENDENCIES
+from backend.routers.agent import NEXT_CURSOR_HEADER
 from backend.routers.agent import router as agent_router
 from backend.routers.auth import router as auth_router
 from backend.routers.chat import router as chat_router
@@ -66,6 +67,7 @@ def create_app():
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
     app.add_middleware(LoggingMiddleware)
     app.add_middleware(MetricsMiddleware)
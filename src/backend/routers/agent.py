@@ -1,4 +1,7 @@
+import datetime
+
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 
 from backend.config.routers import RouterName
 from backend.config.tools import ALL_TOOLS
@@ -20,17 +23,63 @@ from backend.schemas.agent import (
     UpdateAgentToolMetadata,
 )
 from backend.services.auth.utils import get_header_user_id
+from backend.services.cache import clear_cached, get_cached, set_cached
 from backend.services.request_validators import (
     validate_create_agent_request,
     validate_update_agent_request,
     validate_user_header,
 )
 
+# Endpoints are declared with `def` rather than `async def` as the CRUD layer uses a
+# synchronous session: FastAPI runs them in its threadpool instead of blocking the
+# event loop for every database round-trip. Responses, agents with their nested tools
+# metadata in particular, are encoded with orjson rather than the stdlib json module.
 router = APIRouter(
     prefix="/v1/agents",
+    default_response_class=ORJSONResponse,
 )
 router.name = RouterName.AGENT
 
+# Agent reads are cached for a short time, any write to an agent or its tool
+# metadata invalidates the cached agent along with every cached list page
+AGENT_CACHE_TTL = 300
+AGENT_LIST_CACHE_TTL = 60
+AGENT_LIST_CACHE_NAMESPACE = "agents:list"
+
+# Cursor of the next page of agents, `<created_at>_<id>` of the last agent of a full page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _agent_cache_key(agent_id: str) -> str:
+    return f"agents:{agent_id}"
+
+
+def _parse_cursor(cursor: str) -> tuple[datetime.datetime, str]:
+    created_at, _, agent_id = cursor.partition("_")
+    try:
+        if not agent_id:
+            raise ValueError("Missing agent ID")
+        return datetime.datetime.fromisoformat(created_at), agent_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}.")
+
+
+def _paginated_agents_response(agents: list[dict], limit: int) -> ORJSONResponse:
+    response = ORJSONResponse(agents)
+    if agents and len(agents) == limit:
+        last_agent = agents[-1]
+        response.headers[NEXT_CURSOR_HEADER] = (
+            f"{last_agent['created_at']}_{last_agent['id']}"
+        )
+    return response
+
+
+def _invalidate_agent_cache(agent_id: str | None = None) -> None:
+    clear_cached(
+        key=_agent_cache_key(agent_id) if agent_id else None,
+        namespace=AGENT_LIST_CACHE_NAMESPACE,
+    )
+
 
 @router.post(
     "",
@@ -67,52 +116,84 @@ def create_agent(session: DBSessionDep, agent: CreateAgent, request: Request) ->
         deployment=agent.deployment,
         tools=agent.tools,
     )
+    # Attach the tool metadata to the agent so both are flushed in the same
+    # transaction, with the metadata rows batched into a single INSERT
+    if agent.tools_metadata:
+        agent_data.tools_metadata = [
+            AgentToolMetadataModel(
+                user_id=user_id,
+                tool_name=tool_metadata.tool_name,
+                artifacts=tool_metadata.artifacts,
+            )
+            for tool_metadata in agent.tools_metadata
+        ]
 
     request.state.agent = agent_data
     try:
         created_agent = agent_crud.create_agent(session, agent_data)
-        if agent.tools_metadata:
-            for tool_metadata in agent.tools_metadata:
-                agent_tool_metadata_data = AgentToolMetadataModel(
-                    user_id=user_id,
-                    agent_id=created_agent.id,
-                    tool_name=tool_metadata.tool_name,
-                    artifacts=tool_metadata.artifacts,
-                )
-                agent_tool_metadata_crud.create_agent_tool_metadata(
-                    session, agent_tool_metadata_data
-                )
-        return created_agent
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    _invalidate_agent_cache()
+    return created_agent
+
 
 @router.get("", response_model=list[Agent])
-async def list_agents(
-    *, offset: int = 0, limit: int = 100, session: DBSessionDep, request: Request
-) -> list[Agent]:
+def list_agents(
+    *,
+    offset: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    session: DBSessionDep,
+    request: Request,
+) -> ORJSONResponse:
     """
-    List all agents.
+    List all agents, ordered by creation date.
+
+    Pages can be fetched either with an offset, or by passing the cursor returned in
+    the X-Next-Cursor header of the previous page as `after`, which stays fast for
+    deep pages.
 
     Args:
         offset (int): Offset to start the list.
         limit (int): Limit of agents to be listed.
+        after (str): Cursor of the previous page.
         session (DBSessionDep): Database session.
         request (Request): Request object.
 
     Returns:
-        list[Agent]: List of agents.
+        ORJSONResponse: List of agents, with the next page's cursor in the
+        X-Next-Cursor header.
+
+    Raises:
+        HTTPException: If the cursor is invalid.
     """
+    cursor = _parse_cursor(after) if after else None
+
+    # Each agent is validated once against the Agent schema below, returning the
+    # response directly skips FastAPI validating every row a second time
+    cache_key = f"{AGENT_LIST_CACHE_NAMESPACE}:{after}:{offset}:{limit}"
+    agents = get_cached(cache_key)
+    if agents is not None:
+        return _paginated_agents_response(agents, limit)
+
     try:
-        return agent_crud.get_agents(session, offset=offset, limit=limit)
+        agents = agent_crud.get_agents(
+            session, offset=offset, limit=limit, after=cursor
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    agents = [
+        Agent.model_validate(agent, from_attributes=True).model_dump(mode="json")
+        for agent in agents
+    ]
+    set_cached(cache_key, agents, expire=AGENT_LIST_CACHE_TTL)
+    return _paginated_agents_response(agents, limit)
+
 
 @router.get("/{agent_id}", response_model=Agent)
-async def get_agent_by_id(
-    agent_id: str, session: DBSessionDep, request: Request
-) -> Agent:
+def get_agent_by_id(agent_id: str, session: DBSessionDep, request: Request) -> Agent:
     """
     Args:
         agent_id (str): Agent ID.
@@ -124,8 +205,14 @@ async def get_agent_by_id(
     Raises:
         HTTPException: If the agent with the given ID is not found.
     """
+    cached_agent = get_cached(_agent_cache_key(agent_id))
+    if cached_agent is not None:
+        agent = Agent.model_validate(cached_agent)
+        request.state.agent = agent
+        return agent
+
     try:
-        agent = agent_crud.get_agent_by_id(session, agent_id)
+        agent = agent_crud.get_agent_by_id(session, agent_id, load_tools_metadata=True)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -135,6 +222,12 @@ async def get_agent_by_id(
             detail=f"Agent with ID: {agent_id} not found.",
         )
 
+    agent = Agent.model_validate(agent, from_attributes=True)
+    set_cached(
+        _agent_cache_key(agent_id),
+        agent.model_dump(mode="json"),
+        expire=AGENT_CACHE_TTL,
+    )
     request.state.agent = agent
     return agent
 
@@ -147,7 +240,7 @@ async def get_agent_by_id(
         Depends(validate_update_agent_request),
     ],
 )
-async def update_agent(
+def update_agent(
     agent_id: str,
     new_agent: UpdateAgent,
     session: DBSessionDep,
@@ -168,26 +261,24 @@ async def update_agent(
     Raises:
         HTTPException: If the agent with the given ID is not found.
     """
-    agent = agent_crud.get_agent_by_id(session, agent_id)
+    try:
+        agent = agent_crud.update_agent_by_id(session, agent_id, new_agent)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
     if not agent:
         raise HTTPException(
             status_code=400,
             detail=f"Agent with ID {agent_id} not found.",
         )
 
-    try:
-        agent = agent_crud.update_agent(session, agent, new_agent)
-        request.state.agent = agent
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
+    request.state.agent = agent
+    _invalidate_agent_cache(agent_id)
     return agent
 
 
 @router.delete("/{agent_id}")
-async def delete_agent(
-    agent_id: str, session: DBSessionDep, request: Request
-) -> DeleteAgent:
+def delete_agent(agent_id: str, session: DBSessionDep, request: Request) -> DeleteAgent:
     """
     Delete an agent by ID.
 
@@ -202,7 +293,10 @@ async def delete_agent(
     Raises:
         HTTPException: If the agent with the given ID is not found.
     """
-    agent = agent_crud.get_agent_by_id(session, agent_id)
+    try:
+        agent = agent_crud.delete_agent(session, agent_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
     if not agent:
         raise HTTPException(
@@ -211,11 +305,7 @@ async def delete_agent(
         )
 
     request.state.agent = agent
-    try:
-        agent_crud.delete_agent(session, agent_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
+    _invalidate_agent_cache(agent_id)
     return DeleteAgent()
 
 
@@ -223,9 +313,9 @@ async def delete_agent(
 
 
 @router.get("/{agent_id}/tool-metadata", response_model=list[AgentToolMetadata])
-async def list_agent_tool_metadata(
+def list_agent_tool_metadata(
     agent_id: str, session: DBSessionDep, request: Request
-) -> list[AgentToolMetadata]:
+) -> ORJSONResponse:
     """
     List all agent tool metadata by agent ID.
 
@@ -235,18 +325,31 @@ async def list_agent_tool_metadata(
         request (Request): Request object.
 
     Returns:
-        list[AgentToolMetadata]: List of agent tool metadata.
+        ORJSONResponse: List of agent tool metadata.
 
     Raises:
         HTTPException: If the agent tool metadata retrieval fails.
     """
     try:
-        return agent_tool_metadata_crud.get_all_agent_tool_metadata_by_agent_id(
-            session, agent_id
+        agent_tool_metadata = (
+            agent_tool_metadata_crud.get_all_agent_tool_metadata_by_agent_id(
+                session, agent_id
+            )
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    # Returned directly to skip FastAPI validating every row a second time, as in
+    # list_agents
+    return ORJSONResponse(
+        [
+            AgentToolMetadata.model_validate(metadata, from_attributes=True).model_dump(
+                mode="json"
+            )
+            for metadata in agent_tool_metadata
+        ]
+    )
+
 
 @router.post(
     "/{agent_id}/tool-metadata",
@@ -293,11 +396,12 @@ def create_agent_tool_metadata(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    _invalidate_agent_cache(agent_id)
     return created_agent_tool_metadata
 
 
 @router.put("/{agent_id}/tool-metadata/{agent_tool_metadata_id}")
-async def update_agent_tool_metadata(
+def update_agent_tool_metadata(
     agent_id: str,
     agent_tool_metadata_id: str,
     session: DBSessionDep,
@@ -321,8 +425,9 @@ async def update_agent_tool_metadata(
         HTTPException: If the agent tool metadata with the given ID is not found.
         HTTPException: If the agent tool metadata update fails.
     """
+    # Scoping the lookup to the agent checks both in a single query
     agent_tool_metadata = agent_tool_metadata_crud.get_agent_tool_metadata_by_id(
-        session, agent_tool_metadata_id
+        session, agent_tool_metadata_id, agent_id=agent_id
     )
     if not agent_tool_metadata:
         raise HTTPException(
@@ -338,11 +443,12 @@ async def update_agent_tool_metadata(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    _invalidate_agent_cache(agent_id)
     return agent_tool_metadata
 
 
 @router.delete("/{agent_id}/tool-metadata/{agent_tool_metadata_id}")
-async def delete_agent_tool_metadata(
+def delete_agent_tool_metadata(
     agent_id: str, agent_tool_metadata_id: str, session: DBSessionDep, request: Request
 ) -> DeleteAgentToolMetadata:
     """
@@ -361,8 +467,9 @@ async def delete_agent_tool_metadata(
         HTTPException: If the agent tool metadata with the given ID is not found.
         HTTPException: If the agent tool metadata deletion fails.
     """
+    # Scoping the lookup to the agent checks both in a single query
     agent_tool_metadata = agent_tool_metadata_crud.get_agent_tool_metadata_by_id(
-        session, agent_tool_metadata_id
+        session, agent_tool_metadata_id, agent_id=agent_id
     )
     if not agent_tool_metadata:
         raise HTTPException(
@@ -378,4 +485,5 @@ async def delete_agent_tool_metadata(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    _invalidate_agent_cache(agent_id)
     return DeleteAgentToolMetadata()
@@ -4,6 +4,7 @@ from typing import Any, Generator
 
 from fastapi import APIRouter, Depends, Request
 from sse_starlette.sse import EventSourceResponse
+from starlette.concurrency import run_in_threadpool
 
 from backend.chat.custom.custom import CustomChat
 from backend.chat.custom.langchain import LangChainChat
@@ -130,7 +131,10 @@ async def chat(
         next_message_position,
     ) = process_chat(session, chat_request, request, agent_id)
 
-    return generate_chat_response(
+    # The chat stream, including any tool calls, is consumed synchronously: run it in
+    # the threadpool so blocking model and tool requests don't stall the event loop
+    return await run_in_threadpool(
+        generate_chat_response,
         session,
         CustomChat().chat(
             chat_request,
@@ -0,0 +1,164 @@
+import json
+import os
+import threading
+import time
+from distutils.util import strtobool
+from typing import Any
+
+from backend.services.logger import get_logger
+
+logger = get_logger()
+
+# The cache is shared through Redis. Without it nothing is cached, as a process-local
+# cache would keep serving stale data on replicas that did not handle a write. The
+# in-memory cache can be enabled instead for single process setups, e.g. development.
+REDIS_URL = os.environ.get("REDIS_URL")
+USE_IN_MEMORY_CACHE = bool(strtobool(os.getenv("USE_IN_MEMORY_CACHE", "false")))
+CACHE_PREFIX = "toolkit-cache"
+# Upper bound on the entries kept by the in-memory backend
+IN_MEMORY_CACHE_MAX_ENTRIES = 10_000
+
+
+class InMemoryCacheBackend:
+    """
+    Process-local cache, only safe to use when the backend runs as a single process.
+    """
+
+    def __init__(self, max_entries: int = IN_MEMORY_CACHE_MAX_ENTRIES):
+        self._store: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._store[key]
+                return None
+
+            return value
+
+    def set(self, key: str, value: str, ex: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            # Entries are otherwise only dropped when read again, which never happens
+            # for one-off keys such as list pages with arbitrary offsets
+            for expired_key in [
+                k for k, (expires_at, _) in self._store.items() if expires_at < now
+            ]:
+                del self._store[expired_key]
+
+            self._store.pop(key, None)
+            while len(self._store) >= self._max_entries:
+                # Dicts keep insertion order, evict the oldest entry
+                del self._store[next(iter(self._store))]
+
+            self._store[key] = (now + ex, value)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._store.pop(key, None)
+
+    def scan_iter(self, match: str) -> list[str]:
+        prefix = match.rstrip("*")
+        with self._lock:
+            return [key for key in self._store if key.startswith(prefix)]
+
+
+class NoCacheBackend:
+    """
+    Used when no cache is configured, every read is a miss and writes are dropped.
+    """
+
+    def get(self, key: str) -> None:
+        return None
+
+    def set(self, key: str, value: str, ex: int) -> None:
+        pass
+
+    def delete(self, *keys: str) -> None:
+        pass
+
+    def scan_iter(self, match: str) -> list[str]:
+        return []
+
+
+def _get_backend() -> tuple[Any, tuple[type[Exception], ...]]:
+    """
+    Get the cache backend along with the errors it raises when unreachable.
+
+    Redis is only imported when configured, the other backends have no dependencies.
+    """
+    if REDIS_URL:
+        from redis import Redis, RedisError
+
+        return Redis.from_url(REDIS_URL, decode_responses=True), (RedisError,)
+
+    if USE_IN_MEMORY_CACHE:
+        return InMemoryCacheBackend(), ()
+
+    return NoCacheBackend(), ()
+
+
+backend, backend_errors = _get_backend()
+
+
+def _prefixed(key: str) -> str:
+    return f"{CACHE_PREFIX}:{key}"
+
+
+def get_cached(key: str) -> Any | None:
+    """
+    Get a cached value.
+
+    Args:
+        key (str): Cache key.
+
+    Returns:
+        Any | None: The cached value, or None if the key is missing, expired or the cache is unreachable.
+    """
+    try:
+        value = backend.get(_prefixed(key))
+    except backend_errors as e:
+        logger.warning(f"Failed to read {key} from cache: {e}")
+        return None
+
+    return json.loads(value) if value is not None else None
+
+
+def set_cached(key: str, value: Any, expire: int) -> None:
+    """
+    Cache a JSON serializable value.
+
+    Args:
+        key (str): Cache key.
+        value (Any): Value to cache.
+        expire (int): Time to live in seconds.
+    """
+    try:
+        backend.set(_prefixed(key), json.dumps(value), ex=expire)
+    except backend_errors as e:
+        logger.warning(f"Failed to write {key} to cache: {e}")
+
+
+def clear_cached(key: str | None = None, namespace: str | None = None) -> None:
+    """
+    Invalidate a single cache key and/or every key under a namespace.
+
+    Args:
+        key (str): Cache key to delete.
+        namespace (str): Namespace whose keys should all be deleted, e.g. `agents:list`.
+    """
+    try:
+        keys = [_prefixed(key)] if key else []
+        if namespace:
+            keys.extend(backend.scan_iter(match=f"{_prefixed(namespace)}:*"))
+        if keys:
+            backend.delete(*keys)
+    except backend_errors as e:
+        logger.warning(f"Failed to clear cache: {e}")
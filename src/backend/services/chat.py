@@ -81,7 +81,7 @@ def process_chat(
         model_config = get_deployment_config(request)
 
     if agent_id is not None:
-        agent = agent_crud.get_agent_by_id(session, agent_id)
+        agent = agent_crud.get_agent_by_id(session, agent_id, load_tools_metadata=True)
         request.state.agent = Agent.model_validate(agent)
         if agent is None:
             raise HTTPException(
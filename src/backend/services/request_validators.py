@@ -1,6 +1,7 @@
 from urllib.parse import unquote_plus
 
 from fastapi import HTTPException, Request
+from starlette.concurrency import run_in_threadpool
 
 from backend.config.deployments import AVAILABLE_MODEL_DEPLOYMENTS
 from backend.config.tools import AVAILABLE_TOOLS
@@ -153,7 +154,7 @@ async def validate_create_agent_request(session: DBSessionDep, request: Request)
 
     # TODO @scott-cohere: for now we disregard versions and assume agents have unique names, enforce versioning later
     agent_name = body.get("name")
-    agent = agent_crud.get_agent_by_name(session, agent_name)
+    agent = await run_in_threadpool(agent_crud.get_agent_by_name, session, agent_name)
     if agent:
         raise HTTPException(
             status_code=400, detail=f"Agent {agent_name} already exists."
@@ -203,13 +204,16 @@ async def validate_update_agent_request(session: DBSessionDep, request: Request)
     if not agent_id:
         raise HTTPException(status_code=400, detail="Agent ID is required.")
 
-    agent = agent_crud.get_agent_by_id(session, agent_id)
-    if not agent:
+    # Only the owner is needed here, the agent itself is loaded by the UPDATE
+    agent_user_id = await run_in_threadpool(
+        agent_crud.get_agent_user_id, session, agent_id
+    )
+    if not agent_user_id:
         raise HTTPException(
             status_code=400, detail=f"Agent with ID {agent_id} not found."
         )
 
-    if agent.user_id != get_header_user_id(request):
+    if agent_user_id != get_header_user_id(request):
         raise HTTPException(
             status_code=401, detail=f"Agent with ID {agent_id} does not belong to user."
         )
@@ -6,7 +6,7 @@ import pytest
 from alembic.command import upgrade
 from alembic.config import Config
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session
 
 from backend.config.deployments import AVAILABLE_MODEL_DEPLOYMENTS, ModelDeploymentName
@@ -15,6 +15,8 @@ from backend.main import app, create_app
 from backend.model_deployments.base import BaseDeployment
 from backend.schemas.deployment import Deployment
 from backend.schemas.user import User
+from backend.services import cache
+from backend.services.cache import InMemoryCacheBackend, clear_cached
 from backend.tests.factories import get_factory
 
 DATABASE_URL = os.environ["DATABASE_URL"]
@@ -61,6 +63,35 @@ def session(engine: Any) -> Generator[Session, None, None]:
     connection.close()
 
 
+@pytest.fixture(scope="function")
+def in_memory_cache(monkeypatch) -> InMemoryCacheBackend:
+    """
+    Caches in memory for the duration of a test, nothing is cached otherwise as
+    tests do not configure Redis
+    """
+    backend = InMemoryCacheBackend()
+    monkeypatch.setattr(cache, "backend", backend)
+    return backend
+
+
+@pytest.fixture(scope="function")
+def statements(session: Session) -> Generator[list[str], None, None]:
+    """
+    Yields the list of SQL statements executed through the session, to check
+    database round-trips
+    """
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(session.bind, "before_cursor_execute", record_statement)
+
+    yield statements
+
+    event.remove(session.bind, "before_cursor_execute", record_statement)
+
+
 @pytest.fixture(scope="function")
 def session_client(session: Session) -> Generator[TestClient, None, None]:
     """
@@ -79,6 +110,8 @@ def session_client(session: Session) -> Generator[TestClient, None, None]:
         yield client
 
     app.dependency_overrides = {}
+    # Cached agents would otherwise outlive the rolled back transaction
+    clear_cached(namespace="agents")
 
 
 @pytest.fixture(scope="session")
@@ -139,6 +139,29 @@ def test_get_agent_by_id(session, user):
     assert agent.name == "test_agent"
 
 
+def test_get_agent_by_id_round_trips(session, user, statements):
+    agent = get_factory("Agent", session).create(id="1", user_id=user.id)
+    get_factory("AgentToolMetadata", session).create(
+        agent_id=agent.id, tool_name=ToolName.Google_Drive, artifacts=[]
+    )
+    session.expunge_all()
+    statements.clear()
+
+    agent = agent_crud.get_agent_by_id(session, "1")
+    assert len(statements) == 1
+    session.expunge_all()
+
+    agent = agent_crud.get_agent_by_id(session, "1", load_tools_metadata=True)
+    assert len(agent.tools_metadata) == 1
+    assert len(statements) == 3
+
+
+def test_get_agent_user_id(session, user):
+    _ = get_factory("Agent", session).create(id="1", user_id=user.id)
+    assert agent_crud.get_agent_user_id(session, "1") == user.id
+    assert agent_crud.get_agent_user_id(session, "123") is None
+
+
 def test_get_agent_by_name(session, user):
     _ = get_factory("Agent", session).create(id="1", name="test_agent")
     agent = agent_crud.get_agent_by_name(session, "test_agent")
@@ -160,6 +183,21 @@ def test_list_agents(session, user):
     assert len(agents) == length
 
 
+def test_list_agents_round_trips(session, user, statements):
+    for i in range(3):
+        agent = get_factory("Agent", session).create(name=f"test_agent_{i}")
+        get_factory("AgentToolMetadata", session).create(
+            agent_id=agent.id, tool_name=ToolName.Google_Drive, artifacts=[]
+        )
+    session.expunge_all()
+    statements.clear()
+
+    agents = agent_crud.get_agents(session)
+    assert [len(agent.tools_metadata) for agent in agents] == [1, 1, 1]
+    # The agents, then the tools metadata of all of them
+    assert len(statements) == 2
+
+
 def test_list_agents_empty(session, user):
     agents = agent_crud.get_agents(session)
     assert len(agents) == 0
@@ -167,7 +205,9 @@ def test_list_agents_empty(session, user):
 
 def test_list_conversations_with_pagination(session, user):
     for i in range(10):
-        get_factory("Agent", session).create(name=f"Agent {i}", user_id=user.id)
+        get_factory("Agent", session).create(
+            name=f"Agent {i}", user_id=user.id, created_at=datetime(2024, 1, 1, i)
+        )
 
     agents = agent_crud.get_agents(session, offset=5, limit=5)
     assert len(agents) == 5
@@ -176,6 +216,20 @@ def test_list_conversations_with_pagination(session, user):
         assert agent.name == f"Agent {i + 5}"
 
 
+def test_list_agents_with_keyset_pagination(session, user):
+    agents = [
+        get_factory("Agent", session).create(
+            name=f"Agent {i}", user_id=user.id, created_at=datetime(2024, 1, 1, i)
+        )
+        for i in range(10)
+    ]
+
+    page = agent_crud.get_agents(
+        session, after=(agents[4].created_at, agents[4].id), limit=3
+    )
+    assert [agent.name for agent in page] == ["Agent 5", "Agent 6", "Agent 7"]
+
+
 def test_update_agent(session, user):
     agent = get_factory("Agent", session).create(
         name="test_agent",
@@ -196,7 +250,7 @@ def test_update_agent(session, user):
         tools=[ToolName.Python_Interpreter, ToolName.Calculator],
     )
 
-    agent = agent_crud.update_agent(session, agent, new_agent_data)
+    agent = agent_crud.update_agent_by_id(session, agent.id, new_agent_data)
     assert agent.name == new_agent_data.name
     assert agent.description == new_agent_data.description
     assert agent.version == new_agent_data.version
@@ -205,6 +259,29 @@ def test_update_agent(session, user):
     assert agent.tools == [ToolName.Python_Interpreter, ToolName.Calculator]
 
 
+def test_update_agent_by_id(session, user):
+    agent = get_factory("Agent", session).create(
+        name="test_agent",
+        description="This is a test agent",
+        user_id=user.id,
+    )
+
+    new_agent_data = UpdateAgent(
+        name="new_test_agent",
+        tools=[ToolName.Calculator],
+    )
+
+    agent = agent_crud.update_agent_by_id(session, agent.id, new_agent_data)
+    assert agent.name == new_agent_data.name
+    assert agent.description == "This is a test agent"
+    assert agent.tools == [ToolName.Calculator]
+
+
+def test_update_nonexistent_agent_by_id(session, user):
+    agent = agent_crud.update_agent_by_id(session, "123", UpdateAgent(name="test"))
+    assert agent is None
+
+
 def test_delete_agent(session, user):
     agent = get_factory("Agent", session).create(user_id=user.id)
 
@@ -1,3 +1,4 @@
+import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
@@ -291,6 +292,44 @@ def test_list_agents_with_pagination(
     assert len(response_agents) == 1
 
 
+def test_list_agents_with_cursor_pagination(
+    session_client: TestClient, session: Session
+) -> None:
+    agents = sorted(
+        (get_factory("Agent", session).create() for _ in range(5)),
+        key=lambda agent: (agent.created_at, agent.id),
+    )
+
+    response = session_client.get("/v1/agents?limit=3", headers={"User-Id": "123"})
+    assert response.status_code == 200
+    assert [agent["id"] for agent in response.json()] == [
+        agent.id for agent in agents[:3]
+    ]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = session_client.get(
+        "/v1/agents", params={"limit": 3, "after": cursor}, headers={"User-Id": "123"}
+    )
+    assert response.status_code == 200
+    assert [agent["id"] for agent in response.json()] == [
+        agent.id for agent in agents[3:]
+    ]
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.parametrize(
+    "cursor", ["invalid", "invalid_123", "2024-01-01", "2024-01-01_"]
+)
+def test_fail_list_agents_invalid_cursor(
+    session_client: TestClient, session: Session, cursor: str
+) -> None:
+    response = session_client.get(
+        "/v1/agents", params={"after": cursor}, headers={"User-Id": "123"}
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": f"Invalid cursor: {cursor}."}
+
+
 def test_get_agent(session_client: TestClient, session: Session) -> None:
     agent = get_factory("Agent", session).create(name="test agent")
     agent_tool_metadata = get_factory("AgentToolMetadata", session).create(
@@ -327,6 +366,62 @@ def test_get_nonexistent_agent(session_client: TestClient, session: Session) ->
     assert response.json() == {"detail": "Agent with ID: 456 not found."}
 
 
+def test_get_agent_is_not_cached_by_default(
+    session_client: TestClient, session: Session
+) -> None:
+    agent = get_factory("Agent", session).create(name="test agent")
+
+    response = session_client.get(f"/v1/agents/{agent.id}", headers={"User-Id": "123"})
+    assert response.status_code == 200
+
+    agent.name = "renamed agent"
+    session.commit()
+
+    response = session_client.get(f"/v1/agents/{agent.id}", headers={"User-Id": "123"})
+    assert response.status_code == 200
+    assert response.json()["name"] == "renamed agent"
+
+
+def test_get_agent_is_cached(
+    session_client: TestClient, session: Session, in_memory_cache
+) -> None:
+    agent = get_factory("Agent", session).create(name="test agent")
+
+    response = session_client.get(f"/v1/agents/{agent.id}", headers={"User-Id": "123"})
+    assert response.status_code == 200
+
+    # Changes made outside of the API are not visible until the cache expires
+    agent.name = "renamed agent"
+    session.commit()
+
+    response = session_client.get(f"/v1/agents/{agent.id}", headers={"User-Id": "123"})
+    assert response.status_code == 200
+    assert response.json()["name"] == "test agent"
+
+
+def test_update_agent_invalidates_cache(
+    session_client: TestClient, session: Session, in_memory_cache
+) -> None:
+    agent = get_factory("Agent", session).create(name="test agent", user_id="123")
+
+    response = session_client.get(f"/v1/agents/{agent.id}", headers={"User-Id": "123"})
+    assert response.json()["name"] == "test agent"
+    response = session_client.get("/v1/agents", headers={"User-Id": "123"})
+    assert response.json()[0]["name"] == "test agent"
+
+    response = session_client.put(
+        f"/v1/agents/{agent.id}",
+        json={"name": "new name"},
+        headers={"User-Id": "123"},
+    )
+    assert response.status_code == 200
+
+    response = session_client.get(f"/v1/agents/{agent.id}", headers={"User-Id": "123"})
+    assert response.json()["name"] == "new name"
+    response = session_client.get("/v1/agents", headers={"User-Id": "123"})
+    assert response.json()[0]["name"] == "new name"
+
+
 def test_update_agent(session_client: TestClient, session: Session) -> None:
     agent = get_factory("Agent", session).create(
         name="test agent",
@@ -412,6 +507,29 @@ def test_update_nonexistent_agent(session_client: TestClient, session: Session)
     assert response.json() == {"detail": "Agent with ID 456 not found."}
 
 
+def test_update_agent_round_trips(
+    session_client: TestClient, session: Session, statements: list[str]
+) -> None:
+    agent = get_factory("Agent", session).create(name="test agent", user_id="123")
+    get_factory("AgentToolMetadata", session).create(
+        agent_id=agent.id, tool_name=ToolName.Google_Drive, artifacts=[]
+    )
+    agent_id = agent.id
+    session.commit()
+    statements.clear()
+
+    response = session_client.put(
+        f"/v1/agents/{agent_id}",
+        json={"name": "updated name"},
+        headers={"User-Id": "123"},
+    )
+    assert response.status_code == 200
+    assert response.json()["name"] == "updated name"
+    assert len(response.json()["tools_metadata"]) == 1
+    # Owner check, UPDATE ... RETURNING and the tools metadata
+    assert len(statements) == 3, statements
+
+
 def test_update_agent_wrong_user(session_client: TestClient, session: Session) -> None:
     agent = get_factory("Agent", session).create(user_id="123")
     request_json = {
@@ -694,6 +812,35 @@ def test_update_agent_tool_metadata(
     ]
 
 
+def test_fail_update_agent_tool_metadata_of_other_agent(
+    session_client: TestClient, session: Session
+) -> None:
+    agent = get_factory("Agent", session).create(user_id="123")
+    other_agent = get_factory("Agent", session).create(user_id="123")
+    agent_tool_metadata = get_factory("AgentToolMetadata", session).create(
+        agent_id=agent.id,
+        tool_name=ToolName.Google_Drive,
+        artifacts=[{"name": "/folder1", "ids": "folder1", "type": "folder_id"}],
+    )
+
+    response = session_client.put(
+        f"/v1/agents/{other_agent.id}/tool-metadata/{agent_tool_metadata.id}",
+        json={
+            "artifacts": [{"name": "/folder2", "ids": "folder2", "type": "folder_id"}]
+        },
+        headers={"User-Id": "123"},
+    )
+    assert response.status_code == 400
+    assert response.json() == {
+        "detail": f"Agent tool metadata with ID {agent_tool_metadata.id} not found."
+    }
+
+    session.refresh(agent_tool_metadata)
+    assert agent_tool_metadata.artifacts == [
+        {"name": "/folder1", "ids": "folder1", "type": "folder_id"}
+    ]
+
+
 def test_get_agent_tool_metadata(session_client: TestClient, session: Session) -> None:
     agent = get_factory("Agent", session).create(user_id="123")
     agent_tool_metadata_1 = get_factory("AgentToolMetadata", session).create(
@@ -765,3 +912,27 @@ def test_fail_delete_nonexistent_agent_tool_metadata(
     )
     assert response.status_code == 400
     assert response.json() == {"detail": "Agent tool metadata with ID 789 not found."}
+
+
+def test_fail_delete_agent_tool_metadata_of_other_agent(
+    session_client: TestClient, session: Session
+) -> None:
+    agent = get_factory("Agent", session).create(user_id="123")
+    other_agent = get_factory("Agent", session).create(user_id="123")
+    agent_tool_metadata = get_factory("AgentToolMetadata", session).create(
+        agent_id=agent.id,
+        tool_name=ToolName.Google_Drive,
+        artifacts=[],
+    )
+
+    response = session_client.delete(
+        f"/v1/agents/{other_agent.id}/tool-metadata/{agent_tool_metadata.id}",
+        headers={"User-Id": "123"},
+    )
+    assert response.status_code == 400
+    assert response.json() == {
+        "detail": f"Agent tool metadata with ID {agent_tool_metadata.id} not found."
+    }
+
+    agent_tool_metadata = session.get(AgentToolMetadata, agent_tool_metadata.id)
+    assert agent_tool_metadata is not None
@@ -0,0 +1,158 @@
+import pytest
+from redis import Redis, RedisError
+
+from backend.services import cache
+from backend.services.cache import (
+    InMemoryCacheBackend,
+    NoCacheBackend,
+    clear_cached,
+    get_cached,
+    set_cached,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class UnreachableBackend:
+    def get(self, key):
+        raise RedisError("Connection refused")
+
+    def set(self, key, value, ex):
+        raise RedisError("Connection refused")
+
+    def delete(self, *keys):
+        raise RedisError("Connection refused")
+
+    def scan_iter(self, match):
+        raise RedisError("Connection refused")
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def in_memory_backend(monkeypatch) -> InMemoryCacheBackend:
+    backend = InMemoryCacheBackend()
+    monkeypatch.setattr(cache, "backend", backend)
+    return backend
+
+
+def test_set_and_get_cached(in_memory_backend) -> None:
+    set_cached("agents:1", {"id": "1", "tools": ["calculator"]}, expire=60)
+
+    assert get_cached("agents:1") == {"id": "1", "tools": ["calculator"]}
+    assert get_cached("agents:2") is None
+
+
+def test_get_cached_expired(in_memory_backend, clock) -> None:
+    set_cached("agents:1", {"id": "1"}, expire=60)
+
+    clock.now += 59
+    assert get_cached("agents:1") == {"id": "1"}
+
+    clock.now += 2
+    assert get_cached("agents:1") is None
+
+
+def test_set_purges_expired_entries(in_memory_backend, clock) -> None:
+    for offset in range(10):
+        set_cached(f"agents:list:None:{offset}:100", [], expire=60)
+
+    clock.now += 61
+    set_cached("agents:1", {"id": "1"}, expire=60)
+
+    assert in_memory_backend.scan_iter(match="toolkit-cache:agents:list:*") == []
+    assert get_cached("agents:1") == {"id": "1"}
+
+
+def test_set_evicts_oldest_entry_when_full(monkeypatch) -> None:
+    backend = InMemoryCacheBackend(max_entries=2)
+    monkeypatch.setattr(cache, "backend", backend)
+
+    set_cached("agents:1", {"id": "1"}, expire=60)
+    set_cached("agents:2", {"id": "2"}, expire=60)
+    set_cached("agents:3", {"id": "3"}, expire=60)
+
+    assert get_cached("agents:1") is None
+    assert get_cached("agents:2") == {"id": "2"}
+    assert get_cached("agents:3") == {"id": "3"}
+
+
+def test_clear_cached_key(in_memory_backend) -> None:
+    set_cached("agents:1", {"id": "1"}, expire=60)
+    set_cached("agents:2", {"id": "2"}, expire=60)
+
+    clear_cached(key="agents:1")
+
+    assert get_cached("agents:1") is None
+    assert get_cached("agents:2") == {"id": "2"}
+
+
+def test_clear_cached_namespace(in_memory_backend) -> None:
+    set_cached("agents:1", {"id": "1"}, expire=60)
+    set_cached("agents:list:None:0:100", [], expire=60)
+    set_cached("agents:list:None:100:100", [], expire=60)
+    set_cached("agents:listing", [], expire=60)
+
+    clear_cached(key="agents:1", namespace="agents:list")
+
+    assert get_cached("agents:1") is None
+    assert get_cached("agents:list:None:0:100") is None
+    assert get_cached("agents:list:None:100:100") is None
+    assert get_cached("agents:listing") == []
+
+
+def test_unreachable_backend_is_a_cache_miss(monkeypatch) -> None:
+    monkeypatch.setattr(cache, "backend", UnreachableBackend())
+    monkeypatch.setattr(cache, "backend_errors", (RedisError,))
+
+    set_cached("agents:1", {"id": "1"}, expire=60)
+    assert get_cached("agents:1") is None
+    clear_cached(key="agents:1", namespace="agents:list")
+
+
+def test_nothing_is_cached_without_cache_backend(monkeypatch) -> None:
+    monkeypatch.setattr(cache, "backend", NoCacheBackend())
+
+    set_cached("agents:1", {"id": "1"}, expire=60)
+    assert get_cached("agents:1") is None
+    clear_cached(key="agents:1", namespace="agents:list")
+
+
+@pytest.mark.parametrize(
+    "redis_url, use_in_memory_cache, expected_backend",
+    [
+        (None, False, NoCacheBackend),
+        (None, True, InMemoryCacheBackend),
+    ],
+)
+def test_get_backend(
+    monkeypatch, redis_url, use_in_memory_cache, expected_backend
+) -> None:
+    monkeypatch.setattr(cache, "REDIS_URL", redis_url)
+    monkeypatch.setattr(cache, "USE_IN_MEMORY_CACHE", use_in_memory_cache)
+
+    backend, backend_errors = cache._get_backend()
+
+    assert isinstance(backend, expected_backend)
+    assert backend_errors == ()
+
+
+def test_get_backend_redis(monkeypatch) -> None:
+    monkeypatch.setattr(cache, "REDIS_URL", "redis://localhost:6379")
+    monkeypatch.setattr(cache, "USE_IN_MEMORY_CACHE", True)
+
+    backend, backend_errors = cache._get_backend()
+
+    assert isinstance(backend, Redis)
+    assert backend_errors == (RedisError,)
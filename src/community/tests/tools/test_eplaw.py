@@ -0,0 +1,132 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from community.tools import EPLaw, eplaw
+
+
+def split_questions(line):
+    # Parsing the questions used to split the whole response on ">>>"
+    questions = [question.strip() for question in line.split(">>>")[1:]]
+    return [question for question in questions if question != ""]
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        (">>> What is novelty?", ["What is novelty?"]),
+        (">>>What is novelty?", ["What is novelty?"]),
+        ("  >>>   What is novelty?  ", ["What is novelty?"]),
+        ("Questions: >>> What is novelty?", ["What is novelty?"]),
+        (">>> Article 54 >>> Article 56", ["Article 54", "Article 56"]),
+        (">>>>x", [">x"]),
+        (">>>", []),
+        (">>>   >>> Article 54", ["Article 54"]),
+        ("What is novelty?", []),
+        ("", []),
+    ],
+)
+def test_parse_questions(line, expected) -> None:
+    assert eplaw._parse_questions(line) == expected
+    assert eplaw._parse_questions(line) == split_questions(line)
+
+
+def test_normalize() -> None:
+    assert eplaw._normalize("  What is Article 54?\t") == "what is article 54?"
+
+
+class FakeCohere:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.lock = threading.Lock()
+        self.chat_messages = []
+        self.rerank_documents = None
+
+    def chat_stream(self, **kwargs):
+        yield SimpleNamespace(event_type="stream-start")
+        for chunk in self.chunks:
+            yield SimpleNamespace(event_type="text-generation", text=chunk)
+        yield SimpleNamespace(event_type="stream-end")
+
+    def chat(self, message, **kwargs):
+        with self.lock:
+            self.chat_messages.append(message)
+        return SimpleNamespace(
+            search_queries=[
+                SimpleNamespace(text=message),
+                SimpleNamespace(text=" Patentability "),
+            ]
+        )
+
+    def rerank(self, documents, top_n, **kwargs):
+        self.rerank_documents = documents
+        return SimpleNamespace(
+            results=[
+                SimpleNamespace(index=index)
+                for index in range(min(top_n, len(documents)))
+            ]
+        )
+
+
+class FakeCollection:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.searches = []
+        self.query = SimpleNamespace(hybrid=self.hybrid)
+
+    def hybrid(self, query, limit):
+        with self.lock:
+            self.searches.append(query)
+        return SimpleNamespace(
+            objects=[
+                SimpleNamespace(
+                    uuid=uuid,
+                    properties={"text": uuid, "title": "Title", "url": "URL"},
+                )
+                for uuid in (query, "shared")
+            ]
+        )
+
+
+def test_stream_questions_across_chunks(monkeypatch) -> None:
+    monkeypatch.setattr(
+        eplaw,
+        "co",
+        FakeCohere(
+            [">>> What is Art", "icle 54?\n>>> Novel", "ty\n", ">>> Inventive step"]
+        ),
+    )
+
+    questions = list(EPLaw()._stream_questions("What is novelty?"))
+
+    assert questions == ["What is Article 54?", "Novelty", "Inventive step"]
+
+
+def test_call_deduplicates_questions_and_prompts(monkeypatch) -> None:
+    co = FakeCohere(
+        [">>> What is Article 54?\n>>> what is article 54? \n", ">>> Novelty\n"]
+    )
+    collection = FakeCollection()
+    monkeypatch.setattr(eplaw, "co", co)
+    monkeypatch.setattr(
+        eplaw,
+        "_get_client",
+        lambda: SimpleNamespace(
+            collections=SimpleNamespace(get=lambda name: collection)
+        ),
+    )
+
+    result = EPLaw().call({"query": "novelty"})
+
+    # "novelty" is both the query and a generated question
+    assert sorted(co.chat_messages) == ["What is Article 54?", "novelty"]
+    assert sorted(collection.searches) == sorted(
+        ["novelty", "What is Article 54?", " Patentability "]
+    )
+    # Documents found by several searches are only reranked once
+    assert sorted(co.rerank_documents) == sorted(
+        ["novelty", "What is Article 54?", " Patentability ", "shared"]
+    )
+    assert len(result) == 4
+    assert result[0] == {"text": co.rerank_documents[0], "title": "Title", "url": "URL"}
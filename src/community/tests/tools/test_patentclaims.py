@@ -0,0 +1,161 @@
+import pytest
+import requests
+
+from backend.services import cache
+from community.tools import PatentClaims, patentclaims
+
+CLAIMS = {
+    "ops:world-patent-data": {
+        "ftxt:fulltext-documents": {
+            "ftxt:fulltext-document": {
+                "claims": [
+                    {"@lang": "DE", "claim": {"claim-text": "Anspruch"}},
+                    {"@lang": "EN", "claim": {"claim-text": "Claim"}},
+                ]
+            }
+        }
+    }
+}
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+class FakeSession:
+    def __init__(self):
+        self.token_responses = []
+        self.data_responses = []
+        self.posts = 0
+        self.gets = 0
+
+    def post(self, url, **kwargs):
+        self.posts += 1
+        return self._respond(self.token_responses)
+
+    def get(self, url, **kwargs):
+        self.gets += 1
+        return self._respond(self.data_responses)
+
+    def _respond(self, responses):
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def token_response(expires_in=1200):
+    return FakeResponse(200, {"access_token": "token", "expires_in": expires_in})
+
+
+@pytest.fixture
+def session(monkeypatch) -> FakeSession:
+    session = FakeSession()
+    monkeypatch.setattr(patentclaims, "_session", session)
+    monkeypatch.setattr(patentclaims, "_access_token", None)
+    monkeypatch.setattr(patentclaims, "_access_token_expiry", 0.0)
+    monkeypatch.setattr(cache, "backend", cache.InMemoryCacheBackend())
+    return session
+
+
+def test_patent_claims(session) -> None:
+    session.token_responses = [token_response()]
+    session.data_responses = [FakeResponse(200, CLAIMS)]
+
+    result = PatentClaims().call({"patent_number": "EP1000000"})
+
+    assert result == [{"text": '[{"@lang":"EN","claim":{"claim-text":"Claim"}}]'}]
+
+
+def test_patent_claims_without_english_claims(session) -> None:
+    session.token_responses = [token_response()]
+    session.data_responses = [FakeResponse(200, {})]
+
+    result = PatentClaims().call({"patent_number": "EP1000000"})
+
+    assert result == [{"text": "[]"}]
+
+
+def test_patent_claims_reuses_access_token_until_expiry(session, monkeypatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr(patentclaims.time, "monotonic", lambda: now)
+    session.token_responses = [token_response(expires_in=60), token_response()]
+    session.data_responses = [FakeResponse(200, CLAIMS) for _ in range(3)]
+
+    PatentClaims().call({"patent_number": "EP1000000"})
+    PatentClaims().call({"patent_number": "EP1000001"})
+    assert session.posts == 1
+
+    # Within the expiry margin the token is refreshed
+    now += 60 - patentclaims.TOKEN_EXPIRY_MARGIN
+    PatentClaims().call({"patent_number": "EP1000002"})
+    assert session.posts == 2
+    assert session.gets == 3
+
+
+@pytest.mark.parametrize(
+    "token_response",
+    [
+        FakeResponse(401),
+        requests.exceptions.ConnectionError("Connection refused"),
+        FakeResponse(200, {}),
+        FakeResponse(200, {"access_token": "token", "expires_in": "soon"}),
+    ],
+)
+def test_patent_claims_access_token_failure(session, token_response) -> None:
+    session.token_responses = [token_response]
+
+    result = PatentClaims().call({"patent_number": "EP1000000"})
+
+    assert result == [{"text": "Error: Failed to obtain access token"}]
+    assert session.gets == 0
+
+
+@pytest.mark.parametrize(
+    "data_response",
+    [FakeResponse(404), requests.exceptions.Timeout("Read timed out")],
+)
+def test_patent_claims_data_failure_is_not_cached(session, data_response) -> None:
+    session.token_responses = [token_response()]
+    session.data_responses = [data_response, FakeResponse(200, CLAIMS)]
+
+    result = PatentClaims().call({"patent_number": "EP1000000"})
+    assert result == [{"text": "Error: Failed to retrieve data"}]
+
+    result = PatentClaims().call({"patent_number": "EP1000000"})
+    assert result == [{"text": '[{"@lang":"EN","claim":{"claim-text":"Claim"}}]'}]
+    assert session.gets == 2
+
+
+def test_patent_claims_logs_failed_status_codes(session, monkeypatch) -> None:
+    errors = []
+    monkeypatch.setattr(patentclaims.logger, "error", errors.append)
+    session.token_responses = [FakeResponse(401), token_response()]
+    session.data_responses = [FakeResponse(404)]
+
+    PatentClaims().call({"patent_number": "EP1000000"})
+    PatentClaims().call({"patent_number": "EP1000000"})
+
+    assert errors == [
+        "Failed to obtain access token: status code 401",
+        "Failed to retrieve data: status code 404",
+    ]
+
+
+def test_patent_claims_cache_hit(session) -> None:
+    session.token_responses = [token_response()]
+    session.data_responses = [FakeResponse(200, CLAIMS)]
+
+    first = PatentClaims().call({"patent_number": "EP1000000"})
+    # Reset the token so a cache miss would have to request a new one
+    patentclaims._access_token = None
+    second = PatentClaims().call({"patent_number": "EP1000000"})
+
+    assert first == second
+    assert session.posts == 1
+    assert session.gets == 1
@@ -1,4 +1,8 @@
-from typing import Any, Dict, List
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Any, Dict, Final, Iterator, List
 
 from community.tools import BaseTool
 
@@ -6,7 +10,6 @@ from dotenv import load_dotenv
 import os
 import weaviate
 from weaviate.classes.config import Integrations
-from weaviate.classes.query import Rerank
 
 import cohere
 
@@ -15,83 +18,164 @@ co = cohere.Client()
 load_dotenv()
 cohere_api_key = os.getenv('COHERE_API_KEY')
 
+# Upper bound on concurrent Cohere/Weaviate requests made by a single call,
+# keeps us within the embeddings rate limit configured below
+MAX_CONCURRENT_REQUESTS = 8
+# Number of documents returned by a call
+TOP_N = 5
+
+# Instructs the model to rewrite the user's question into ">>> question" lines
+_PREAMBLE: Final[str] = """
+Your role is to help user's answer questions about European patent law by generating search engine prompts for the User to search to find legal basis or the appropriate resources from the European Patent Office. You should return only a list of simpler questions. Do not include the original question or answers in your response. Always use the following format:
+
+>>> Search engine prompt
+>>> Search engine prompt
+"""
+
+# Weaviate client shared by every call, connected and configured on first use
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> weaviate.WeaviateClient:
+    global _client
+    with _client_lock:
+        if _client is None or not _client.is_connected():
+            _client = weaviate.connect_to_local(
+                port=8088,
+                grpc_port=50051,
+                headers={
+                    "X_Cohere-Api-Key": cohere_api_key
+                }
+            )
+            # Built here rather than at import time, Integrations.cohere rejects a
+            # missing API key and the tool is imported even when it is not used
+            _client.integrations.configure([
+                Integrations.cohere(
+                    api_key=cohere_api_key,
+                    requests_per_minute_embeddings=40,
+                ),
+            ])
+        return _client
+
+
+@atexit.register
+def _close_client() -> None:
+    if _client is not None:
+        _client.close()
+
+
+def _normalize(text: str) -> str:
+    """
+    Key used to deduplicate questions and prompts, ignoring case and surrounding whitespace.
+    """
+    return text.strip().lower()
+
+
+def _parse_questions(line: str) -> List[str]:
+    """
+    Get the text of each ">>> question" on a streamed line, skipping empty ones.
+    """
+    questions = [question.strip() for question in line.split(">>>")[1:]]
+    return [question for question in questions if question]
+
+
 class EPLaw(BaseTool):
   
     @classmethod
     def is_available(cls) -> bool:
         return True
     
+    def _generate_search_queries(self, question: str) -> List[str]:
+        search_prompts = co.chat(
+            search_queries_only=True,
+            model="command-r-plus",
+            message=question,
+        )
+        return [search_query.text for search_query in search_prompts.search_queries]
+
+    def _search(self, collection: Any, prompt: str) -> List[Any]:
+        response = collection.query.hybrid(
+            query=prompt,
+            limit=5,
+        )
+        return response.objects
+
+    def _rerank(self, query: str, objects: List[Any]) -> List[Any]:
+        if not objects:
+            return []
+
+        reranked = co.rerank(
+            model="rerank-english-v3.0",
+            query=query,
+            documents=[obj.properties.get("text", "") for obj in objects],
+            top_n=TOP_N,
+        )
+        return [objects[result.index] for result in reranked.results]
+
+    def _stream_questions(self, query: str) -> Iterator[str]:
+        """
+        Yield each generated question as soon as its line has been streamed.
+        """
+        buffer = ""
+        for event in co.chat_stream(
+            model="command-r-plus",
+            preamble=_PREAMBLE,
+            message=query,
+        ):
+            if event.event_type != "text-generation":
+                continue
+
+            buffer += event.text
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                yield from _parse_questions(line)
+
+        yield from _parse_questions(buffer)
+
     def call(self, parameters: dict, **kwargs: Any) -> List[Dict[str, Any]]:
         query = parameters.get("query", "")
         
-        client = weaviate.connect_to_local(
-			port=8088,
-			grpc_port=50051,
-			headers={
-				"X_Cohere-Api-Key": cohere_api_key
-			}
-		)
-
-        integrations = [
-			Integrations.cohere(
-				api_key=cohere_api_key,
-				requests_per_minute_embeddings=40,
-			),
-		]
-        client.integrations.configure(integrations)
-        collection = client.collections.get("EPO_LEGAL_DOCS")
-        preamble = """
-Your role is to help user's answer questions about European patent law by generating search engine prompts for the User to search to find legal basis or the appropriate resources from the European Patent Office. You should return only a list of simpler questions. Do not include the original question or answers in your response. Always use the following format:
+        collection = _get_client().collections.get("EPO_LEGAL_DOCS")
+        seen_questions = set()
+        seen_prompts = set()
+        seen_prompts_lock = threading.Lock()
+        searches = []
+
+        def search_question(question: str) -> None:
+            for prompt in self._generate_search_queries(question):
+                # LLM rewrites often repeat prompts, each search is costly so only run it once
+                with seen_prompts_lock:
+                    if _normalize(prompt) in seen_prompts:
+                        continue
+                    seen_prompts.add(_normalize(prompt))
+                    searches.append(executor.submit(self._search, collection, prompt))
+
+        # Each question is processed (search query generation, then the searches) as
+        # soon as it has been generated, concurrently with the remaining generation
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            question_tasks = []
+            for question in chain([query], self._stream_questions(query)):
+                if _normalize(question) in seen_questions:
+                    continue
+                seen_questions.add(_normalize(question))
+                question_tasks.append(executor.submit(search_question, question))
+
+            for task in question_tasks:
+                task.result()
+            object_full = [obj for search in searches for obj in search.result()]
 
->>> Search engine prompt
->>> Search engine prompt
-"""
-        response = co.chat(
-			model="command-r-plus",
-			preamble=preamble,
-			message=query,
-		)
-
-        generated_questions = response.text.split(">>>")[1:]
-        generated_questions = [ q.strip() for q in generated_questions if q.strip() != ""]  
-        generated_questions.append(query)
-        
-        search_results = []
-        for question in generated_questions:
-            search_prompts = co.chat(
-                search_queries_only=True,
-                model="command-r-plus",
-                message=question,
-            )
-            for search_query in search_prompts.search_queries:
-                search_results.append(search_query.text)
-        
-        object_full = []
-
-        for prompt in search_results:
-            response = collection.query.hybrid(
-                query=prompt, 
-                limit=5,
-                rerank=Rerank(
-                    prop="text",
-                    query=query,
-                )
-            )
-            for obj in response.objects:
-                object_full.append(obj) 
-            
         unique_objects = {obj.uuid: obj for obj in object_full}
 
-        sorted_objects = sorted(unique_objects.values(), key=lambda x: x.metadata.rerank_score, reverse=True)
-        
-        sorted_objects = sorted_objects[:5]
-        
-        client.close()
+        # Rerank the merged candidates against the original query in a single request,
+        # rather than having Weaviate rerank the results of every search separately
+        sorted_objects = self._rerank(query, list(unique_objects.values()))
+
         return [
             {
                 "text": doc.properties.get("text", None),
-                "title": doc.metadata.get("title", None),
-                "url": doc.metadata.get("url", None),
+                "title": doc.properties.get("title", None),
+                "url": doc.properties.get("url", None),
             }
             for doc in sorted_objects
         ]
\ No newline at end of file
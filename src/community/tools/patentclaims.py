@@ -1,10 +1,19 @@
+import threading
+import time
 from typing import Any, Dict, List
 
+from backend.services.cache import get_cached, set_cached
+from backend.services.logger import get_logger
 from community.tools import BaseTool
 
 from dotenv import load_dotenv
+import orjson
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = get_logger()
 
 load_dotenv()
 client_id_key = os.getenv('PATENT_CLIENT_EPO_API_KEY')
@@ -13,6 +22,68 @@ client_secret_key = os.getenv('PATENT_CLIENT_EPO_SECRET')
 # OAuth2 Token Endpoint
 token_url = 'https://ops.epo.org/3.2/auth/accesstoken'
 
+# Refresh the access token this many seconds before it actually expires
+TOKEN_EXPIRY_MARGIN = 30
+REQUEST_TIMEOUT = 10
+# Published claims do not change, so lookups can be cached for a long time
+CLAIMS_CACHE_TTL = 60 * 60 * 24
+
+# Session shared by every call so connections to ops.epo.org are kept alive
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        # The token request is a POST, but is safe to retry
+        allowed_methods=frozenset({'GET', 'POST'}),
+    ),
+))
+
+_access_token = None
+_access_token_expiry = 0.0
+_access_token_lock = threading.Lock()
+
+
+def _get_access_token() -> str | None:
+    """
+    Get an OPS access token, reusing the cached one until it is about to expire.
+
+    Returns:
+        str | None: The access token, or None if it could not be obtained.
+    """
+    global _access_token, _access_token_expiry
+    with _access_token_lock:
+        if _access_token is not None and time.monotonic() < _access_token_expiry - TOKEN_EXPIRY_MARGIN:
+            return _access_token
+
+        try:
+            auth_response = _session.post(token_url, data={
+                'grant_type': 'client_credentials',
+            }, auth=(client_id_key, client_secret_key), timeout=REQUEST_TIMEOUT)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to obtain access token: {e}")
+            return None
+
+        if auth_response.status_code != 200:
+            logger.error(f"Failed to obtain access token: status code {auth_response.status_code}")
+            return None
+
+        try:
+            auth = auth_response.json()
+            access_token = auth['access_token']
+            expires_in = int(auth.get('expires_in', 0))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.error(f"Failed to obtain access token: malformed response: {e!r}")
+            return None
+
+        _access_token = access_token
+        _access_token_expiry = time.monotonic() + expires_in
+        return _access_token
+
+
 class PatentClaims(BaseTool):
 
     @classmethod
@@ -21,48 +92,55 @@ class PatentClaims(BaseTool):
 
     def call(self, parameters: dict, **kwargs: Any) -> List[Dict[str, Any]]:
         query = parameters.get("patent_number", "")
-        
+        pattype='publication'
+        format='epodoc'
+
+        cache_key = f'epo:claims:{pattype}:{format}:{query}'
+        text = get_cached(cache_key)
+        if text is not None:
+            return [{"text": text}]
+
+        access_token = _get_access_token()
+        if access_token is None:
+            return [{"text": "Error: Failed to obtain access token"}]
+
+        # Set the API URL for the data request
+        data_url = f'https://ops.epo.org/3.2/rest-services/published-data/{pattype}/{format}/{query}/claims'
+
+        # Set the headers for the data request, including the obtained access token
+        headers = {
+            'accept': 'application/json',
+            'Authorization': f'Bearer {access_token}'
+        }
+
+        # Send a GET request with the access token
         try:
-            auth_response = requests.post(token_url, data={
-                'grant_type': 'client_credentials',
-            }, auth=(client_id_key, client_secret_key))
-        except Exception as e:
-            print(f"Failed to obtain access token: {e}")
-            data = "Error: Failed to obtain access token"
-            auth_response = None
-        
-        if auth_response.status_code == 200:
-            # Extract the access token from the response
-            access_token = auth_response.json()['access_token']
-            pattype='publication'
-            format='epodoc'
-            
-            # Set the API URL for the data request
-            data_url = f'https://ops.epo.org/3.2/rest-services/published-data/{pattype}/{format}/{query}/claims'
-            
-            # Set the headers for the data request, including the obtained access token
-            headers = {
-                'accept': 'application/json',
-                'Authorization': f'Bearer {access_token}'
-            }
-            
-            # Send a GET request with the access token
-            response = requests.get(data_url, headers=headers)
-            
-                        # Check if the data request was successful
-            if response.status_code == 200:
-                # Process the response
-                data = response.json()  # Assuming the API returns JSON data
-                claims = data.get('ops:world-patent-data', {}) \
-                .get('ftxt:fulltext-documents', {}) \
-                .get('ftxt:fulltext-document', {}) \
-                .get('claims', [])
-
-                # Filtering the claims by language
-                claims_in_english = [claim for claim in claims if claim.get('@lang') == 'EN']
-            else:
-                data = "Error: Failed to retrieve data"
-        else:
-            data = "Error: Failed to obtain access token"
-        
-        return [{"text":  f"{claims_in_english}"}]
\ No newline at end of file
+            response = _session.get(data_url, headers=headers, timeout=REQUEST_TIMEOUT)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to retrieve data: {e}")
+            return [{"text": "Error: Failed to retrieve data"}]
+
+        # Check if the data request was successful
+        if response.status_code != 200:
+            logger.error(f"Failed to retrieve data: status code {response.status_code}")
+            return [{"text": "Error: Failed to retrieve data"}]
+
+        # Process the response
+        try:
+            data = response.json()
+        except ValueError as e:
+            logger.error(f"Failed to retrieve data: malformed response: {e!r}")
+            return [{"text": "Error: Failed to retrieve data"}]
+        claims = data.get('ops:world-patent-data', {}) \
+        .get('ftxt:fulltext-documents', {}) \
+        .get('ftxt:fulltext-document', {}) \
+        .get('claims', [])
+
+        # Claims are grouped by language, stop at the English ones
+        claim_in_english = next((claim for claim in claims if claim.get('@lang') == 'EN'), None)
+        claims_in_english = [claim_in_english] if claim_in_english else []
+
+        text = orjson.dumps(claims_in_english).decode()
+        set_cached(cache_key, text, expire=CLAIMS_CACHE_TTL)
+
+        return [{"text": text}]